@@ -4,18 +4,114 @@ os.environ['HF_HUB_DISABLE_TELEMETRY'] = '1'
 
 import gradio as gr
 import edge_tts
+import aiofiles
 import asyncio
+import hashlib
 import tempfile
 import json
+import re
+import time
 import traceback
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json as orjson
+    _DECODER = json.JSONDecoder()
+
+    def _loads(s):
+        """Parse JSON with raw_decode, rejecting anything but whitespace after the first value"""
+        # Skip whitespace by index rather than copying, so error positions refer to the original text
+        obj, end = _DECODER.raw_decode(s, json.decoder.WHITESPACE.match(s, 0).end())
+        end = json.decoder.WHITESPACE.match(s, end).end()
+        if end != len(s):
+            raise json.JSONDecodeError("Extra data", s, end)
+        return obj
+
+
+# Inputs larger than this are parsed in a worker thread so the event loop keeps serving TTS streams
+_THREADED_PARSE_THRESHOLD = 65536
+
+async def _loads_async(s):
+    """Parse JSON from a coroutine, off the event loop for large inputs"""
+    if len(s) > _THREADED_PARSE_THRESHOLD:
+        return await asyncio.to_thread(_loads, s)
+    return _loads(s)
+
+# Example JSON for demonstration
+EXAMPLE_JSON = '''[
+    {"text": "Face", "file_name": "word_face.mp3"},
+    {"text": "Touch your face.", "file_name": "sent_face.mp3"},
+    {"text": "Wash", "file_name": "word_wash.mp3"},
+    {"text": "Wash, wash, wash.", "file_name": "sent_wash.mp3"},
+    {"text": "Water", "file_name": "word_water.mp3"},
+    {"text": "The water is cool.", "file_name": "sent_water.mp3"},
+    {"text": "Let's go! Water time.", "file_name": "guide_day2_step1.mp3"},
+    {"text": "Touch the water. Cool!", "file_name": "guide_day2_step2.mp3"},
+    {"text": "Wash your face. Good job!", "file_name": "guide_day2_step3.mp3"},
+    {"text": "(Sound of running water) Splash, splash! Water is cool. Wash, wash, wash your face. Now you are clean!",
+     "file_name": "scenario_day2.mp3"},
+    {"text": "Bear has a dirty face. He wants to be clean. He goes to the water. Splash, splash. He washes his face. He uses a towel. Rub, rub, rub. Look! Bear has a clean face. Good morning, Bear!",
+     "file_name": "story_day2.mp3"}
+]'''
+
+
+# Prefix for files selected from the output_audio listing (names come from the directory scan)
+_OUT_BASE = "output_audio" + os.sep
+
+# Minimum seconds between batch progress updates pushed to the UI
+_PROGRESS_INTERVAL = 0.1
+
+# Voice list cache: (fetched_at, voices); the Edge voice list rarely changes
+_VOICES_TTL = 3600
+_voices_cache = None
+_voices_lock = asyncio.Lock()
 
 async def get_voices():
-    voices = await edge_tts.list_voices()
-    return {f"{v['ShortName']} - {v['Locale']} ({v['Gender']})": v['ShortName'] for v in voices}
+    global _voices_cache
+    async with _voices_lock:
+        if _voices_cache and time.monotonic() - _voices_cache[0] < _VOICES_TTL:
+            return _voices_cache[1]
+        voices = await edge_tts.list_voices()
+        result = {f"{v['ShortName']} - {v['Locale']} ({v['Gender']})": v['ShortName'] for v in voices}
+        _voices_cache = (time.monotonic(), result)
+        return result
+
+# Sidecars live in a hidden subdirectory so the audio folder itself only holds mp3 files
+_META_DIR = ".tts_meta"
+
+def _cache_key_path(output_path):
+    """Return the .meta sidecar path for output_path, e.g. output_audio/.tts_meta/word.mp3.meta"""
+    audio_dir, name = os.path.split(output_path)
+    return os.path.join(audio_dir, _META_DIR, name + ".meta")
+
+def _tts_cache_key(text, voice, rate, pitch):
+    """Hash the synthesis parameters stored in the .meta sidecar of each generated file"""
+    voice_short_name = (voice or "").split(" - ")[0]
+    return hashlib.blake2b(f"{text}|{voice_short_name}|{rate}|{pitch}".encode(), digest_size=16).hexdigest()
 
-async def text_to_speech(text, voice, rate, pitch, output_dir=None, file_name=None):
-    """Convert text to speech with specified voice, rate and pitch"""
+def _read_cache_key(output_path):
+    """Return the sidecar key for output_path, or None if the audio or its sidecar is missing"""
+    if not os.path.exists(output_path):
+        return None
+    try:
+        with open(_cache_key_path(output_path), encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _remove_cache_key(output_path):
+    try:
+        os.remove(_cache_key_path(output_path))
+    except FileNotFoundError:
+        pass
+
+async def text_to_speech(text, voice, rate, pitch, output_dir=None, file_name=None, make_dirs=True):
+    """Convert text to speech with specified voice, rate and pitch
+
+    Pass make_dirs=False when the caller has already created output_dir.
+    """
     if not text.strip():
         return None, "Please enter text to convert."
     if not voice:
@@ -24,82 +120,194 @@ async def text_to_speech(text, voice, rate, pitch, output_dir=None, file_name=No
     voice_short_name = voice.split(" - ")[0]
     rate_str = f"{rate:+d}%"
     pitch_str = f"{pitch:+d}Hz"
+    # No shared aiohttp connector is passed here: Communicate wraps it in a ClientSession that
+    # owns (and closes) the connector on exit, and websocket connections are never pooled anyway
     communicate = edge_tts.Communicate(text, voice_short_name, rate=rate_str, pitch=pitch_str)
     
     # Determine output path
     if output_dir and file_name:
-        # Ensure output directory exists
-        os.makedirs(output_dir, exist_ok=True)
+        # Ensure output directory exists without blocking the event loop
+        if make_dirs:
+            await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, file_name)
     else:
-        # Use temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-            output_path = tmp_file.name
+        # Use temp file; only the path is needed, so release the descriptor immediately
+        fd, output_path = await asyncio.to_thread(tempfile.mkstemp, suffix=".mp3")
+        os.close(fd)
+    
+    if output_dir and file_name:
+        # Drop any stale sidecar first so a failed synthesis is never treated as cached
+        await asyncio.to_thread(_remove_cache_key, output_path)
     
-    await communicate.save(output_path)
+    # Stream audio chunks straight to disk instead of buffering the whole clip
+    async with aiofiles.open(output_path, "wb") as f:
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                await f.write(chunk["data"])
+    
+    if output_dir and file_name:
+        meta_path = _cache_key_path(output_path)
+        await asyncio.to_thread(os.makedirs, os.path.dirname(meta_path), exist_ok=True)
+        async with aiofiles.open(meta_path, "w", encoding="utf-8") as f:
+            await f.write(_tts_cache_key(text, voice, rate, pitch))
     return output_path, None
 
-async def batch_text_to_speech(json_input, default_voice, default_rate, default_pitch, output_dir="output_audio"):
-    """Process batch text-to-speech conversion from JSON input with progress tracking"""
+async def batch_text_to_speech(json_input, default_voice, default_rate, default_pitch, output_dir="output_audio", overwrite=True, tasks=None):
+    """Process batch text-to-speech conversion from JSON input with progress tracking
+
+    Callers that already parsed json_input can pass the result as tasks to skip parsing it again.
+    With overwrite=False, items whose file already exists with matching text, voice, rate
+    and pitch (per its .meta sidecar under .tts_meta/) are skipped instead of being synthesized again.
+    """
     try:
-        # Parse JSON input
-        tasks = json.loads(json_input)
+        # Parse JSON input unless the caller already did
+        if tasks is None:
+            tasks = await _loads_async(json_input)
         if not isinstance(tasks, list):
             yield None, "Error: JSON input must be a list", [], 0, 0
             return
         
         total_tasks = len(tasks)
         
-        # Process each task
-        results = []
-        generated_files = []
+        # Create the output directory once for the whole batch
+        await asyncio.to_thread(os.makedirs, output_dir, exist_ok=True)
+        
+        # Results are written by index so ordering matches the JSON input
+        results = [None] * total_tasks
+        generated_files = [None] * total_tasks
+        
+        # Validate required fields up front so only valid items reach the TTS service
+        valid_tasks = []
         for i, task in enumerate(tasks):
-            # Update progress (0-based to 1-based index)
-            current_progress = i + 1
-            
-            # Validate required fields
-            if "text" not in task or "file_name" not in task:
-                results.append(f"Error in item {i}: Missing required fields 'text' or 'file_name'")
-                # Still yield progress even if there's an error
-                yield results, None, generated_files, current_progress, total_tasks
-                continue
-            
+            if isinstance(task, dict) and "text" in task and "file_name" in task:
+                valid_tasks.append((i, task))
+            else:
+                results[i] = f"Error in item {i}: Missing required fields 'text' or 'file_name'"
+        completed = total_tasks - len(valid_tasks)
+        if completed:
+            # Report all validation errors at once
+            yield [r for r in results if r is not None], None, [], completed, total_tasks
+        
+        # Bound concurrency to avoid being throttled by the Edge TTS service
+        sem = asyncio.Semaphore(5)
+        
+        # Items sharing a file_name must not write the same file concurrently
+        path_locks = {task["file_name"]: asyncio.Lock() for _, task in valid_tasks}
+        
+        async def synthesize(i, task):
             # Use task-specific settings or defaults
             task_voice = task.get("voice", default_voice)
             task_rate = task.get("rate", default_rate)
             task_pitch = task.get("pitch", default_pitch)
             
-            # Generate audio
-            audio_path, error = await text_to_speech(
-                task["text"],
-                task_voice,
-                task_rate,
-                task_pitch,
-                output_dir,
-                task["file_name"]
-            )
+            # Skip synthesis when the existing file was produced from identical settings
+            if not overwrite:
+                output_path = os.path.join(output_dir, task["file_name"])
+                cached_key = await asyncio.to_thread(_read_cache_key, output_path)
+                if cached_key == _tts_cache_key(task["text"], task_voice, task_rate, task_pitch):
+                    results[i] = f"Cached: {task['file_name']}"
+                    generated_files[i] = task['file_name']
+                    return
+            
+            # Generate audio; a failure is reported for this item only so siblings can finish
+            async with sem:
+                try:
+                    audio_path, error = await text_to_speech(
+                        task["text"],
+                        task_voice,
+                        task_rate,
+                        task_pitch,
+                        output_dir,
+                        task["file_name"],
+                        make_dirs=False
+                    )
+                except Exception as e:
+                    audio_path, error = None, str(e)
             
             if error:
-                results.append(f"Error in item {i}: {error}")
+                results[i] = f"Error in item {i}: {error}"
             else:
-                results.append(f"Successfully generated: {task['file_name']}")
-                generated_files.append(task['file_name'])
-            
-            # Yield progress after each task
-            yield results, None, generated_files, current_progress, total_tasks
+                results[i] = f"Successfully generated: {task['file_name']}"
+                generated_files[i] = task['file_name']
+        
+        async def run(i, task):
+            # Locks are acquired in creation order, so duplicates run in JSON order and the last one wins
+            async with path_locks[task["file_name"]]:
+                await synthesize(i, task)
+        
+        tasks_f = [asyncio.create_task(run(i, task)) for i, task in valid_tasks]
+        try:
+            for fut in asyncio.as_completed(tasks_f):
+                await fut
+                completed += 1
+                # Yield progress after each task, keeping only finished entries
+                yield ([r for r in results if r is not None], None,
+                       [f for f in generated_files if f is not None], completed, total_tasks)
+        finally:
+            # Only has an effect if the generator is closed before every task finished
+            for t in tasks_f:
+                t.cancel()
+        
+        results = [r for r in results if r is not None]
+        generated_files = [f for f in generated_files if f is not None]
         
         # Final yield with complete results
         yield results, None, generated_files, total_tasks, total_tasks
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, orjson.JSONDecodeError) as e:
         yield None, f"JSON parsing error: {str(e)}", [], 0, 0
     except Exception as e:
         yield None, f"Error processing batch: {str(e)}\n{traceback.format_exc()}", [], 0, 0
 
+async def _throttle_progress(updates, interval=_PROGRESS_INTERVAL):
+    """Re-yield batch_text_to_speech progress updates at most once per interval
+
+    Errors and the final update pass through immediately. An update held back by the
+    throttle is flushed once the interval elapses, even if no newer update has arrived.
+    """
+    next_update = asyncio.ensure_future(updates.__anext__())
+    last_emit = 0.0
+    pending = None
+    try:
+        while True:
+            timeout = None if pending is None else max(0.0, last_emit + interval - time.monotonic())
+            done, _ = await asyncio.wait({next_update}, timeout=timeout)
+            if not done:
+                # Deadline reached while waiting for the next task: flush the held-back update
+                last_emit = time.monotonic()
+                yield pending
+                pending = None
+                continue
+            
+            try:
+                update = next_update.result()
+            except StopAsyncIteration:
+                break
+            next_update = asyncio.ensure_future(updates.__anext__())
+            
+            _, error, _, current, total = update
+            now = time.monotonic()
+            if error or current == total or now - last_emit > interval:
+                last_emit = now
+                pending = None
+                yield update
+            else:
+                pending = update
+    finally:
+        if not next_update.done():
+            next_update.cancel()
+            try:
+                await next_update
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+        await updates.aclose()
+
+# 预编译用于create_abbreviation的特殊字符正则
+_ABBR_RE = re.compile(r'[^\w\s]')
+
 def create_abbreviation(text, max_length=20):
     """从文本创建缩写文件名，移除特殊字符并限制长度"""
     # 移除特殊字符，只保留字母、数字和空格
-    import re
-    cleaned_text = re.sub(r'[^\w\s]', '', text)
+    cleaned_text = _ABBR_RE.sub('', text)
     # 取前max_length个字符作为基础
     abbreviation = cleaned_text[:max_length].strip()
     # 替换空格为下划线
@@ -123,7 +331,7 @@ async def tts_interface(text, voice, rate, pitch):
 async def single_item_interface(json_input, index, default_voice, default_rate, default_pitch):
     """Generate audio for a single item from JSON input"""
     try:
-        tasks = json.loads(json_input)
+        tasks = await _loads_async(json_input)
         if not isinstance(tasks, list):
             return None, gr.Warning("Error: JSON input must be a list")
         
@@ -151,30 +359,16 @@ async def single_item_interface(json_input, index, default_voice, default_rate,
         if error:
             return None, gr.Warning(error)
         return audio_path, None
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, orjson.JSONDecodeError) as e:
         return None, gr.Warning(f"JSON parsing error: {str(e)}")
     except Exception as e:
         return None, gr.Warning(f"Error: {str(e)}")
 
 async def create_demo():
     voices = await get_voices()
-    
-    # Example JSON for demonstration
-    example_json = '''[
-        {"text": "Face", "file_name": "word_face.mp3"},
-        {"text": "Touch your face.", "file_name": "sent_face.mp3"},
-        {"text": "Wash", "file_name": "word_wash.mp3"},
-        {"text": "Wash, wash, wash.", "file_name": "sent_wash.mp3"},
-        {"text": "Water", "file_name": "word_water.mp3"},
-        {"text": "The water is cool.", "file_name": "sent_water.mp3"},
-        {"text": "Let's go! Water time.", "file_name": "guide_day2_step1.mp3"},
-        {"text": "Touch the water. Cool!", "file_name": "guide_day2_step2.mp3"},
-        {"text": "Wash your face. Good job!", "file_name": "guide_day2_step3.mp3"},
-        {"text": "(Sound of running water) Splash, splash! Water is cool. Wash, wash, wash your face. Now you are clean!",
-         "file_name": "scenario_day2.mp3"},
-        {"text": "Bear has a dirty face. He wants to be clean. He goes to the water. Splash, splash. He washes his face. He uses a towel. Rub, rub, rub. Look! Bear has a clean face. Good morning, Bear!",
-         "file_name": "story_day2.mp3"}
-    ]'''
+    # 两个标签页共用同一份语音选项和默认语音（en-US-AriaNeural）
+    choice_list = [""] + list(voices)
+    default_voice_value = "en-US-AriaNeural - en-US (Female)" if "en-US-AriaNeural - en-US (Female)" in voices else ""
     
     with gr.Blocks(analytics_enabled=False) as demo:
         gr.Markdown("# 🎙️ Edge TTS Text-to-Speech (批量处理版)")
@@ -190,9 +384,7 @@ async def create_demo():
                         text_input = gr.Textbox(label="输入文本", lines=5, placeholder="请输入要转换为语音的文本...")
                         
                         gr.Markdown("## 参数设置")
-                        # 设置默认语音为en-US-AriaNeural
-                        default_voice_value = "en-US-AriaNeural - en-US (Female)" if "en-US-AriaNeural - en-US (Female)" in voices else ""
-                        voice_dropdown = gr.Dropdown(choices=[""] + list(voices.keys()), label="选择语音", value=default_voice_value)
+                        voice_dropdown = gr.Dropdown(choices=choice_list, label="选择语音", value=default_voice_value)
                         rate_slider = gr.Slider(minimum=-50, maximum=50, value=0, label="语速调整 (%)", step=1)
                         pitch_slider = gr.Slider(minimum=-20, maximum=20, value=0, label="音调调整 (Hz)", step=1)
                         
@@ -208,23 +400,17 @@ async def create_demo():
                         gr.Markdown("## 处理结果")
                         single_result = gr.Textbox(label="状态信息", interactive=False)
                 
-                # 定义更新结果的函数
-                async def update_with_result(audio, warning):
-                    if warning:
-                        return audio, warning, "生成失败"
-                    return audio, warning, "生成成功"
-                
-                generate_btn.click(
-                    fn=update_with_result,
-                    inputs=[audio_output, warning_md],
-                    outputs=[audio_output, warning_md, single_result]
-                )
+                # 生成音频并在一次回调中同时更新音频、警告和状态信息
+                async def do_generate(text, voice, rate, pitch):
+                    audio, warning = await tts_interface(text, voice, rate, pitch)
+                    # gr.Warning只弹出提示并不返回内容，因此以是否生成音频来判断结果
+                    status = "生成失败" if audio is None else "生成成功"
+                    return audio, warning, status
                 
-                # 先调用tts_interface生成音频
                 generate_btn.click(
-                    fn=tts_interface,
+                    fn=do_generate,
                     inputs=[text_input, voice_dropdown, rate_slider, pitch_slider],
-                    outputs=[audio_output, warning_md]
+                    outputs=[audio_output, warning_md, single_result]
                 )
             
             # Batch Processing Tab
@@ -238,28 +424,28 @@ async def create_demo():
                             label="JSON输入", 
                             lines=8, 
                             placeholder="请输入JSON格式的文本列表...",
-                            value=example_json
+                            value=EXAMPLE_JSON
                         )
                         
                         with gr.Row():
                             load_example_btn = gr.Button("加载示例JSON")
                             
                         load_example_btn.click(
-                            fn=lambda: example_json,
+                            fn=lambda: EXAMPLE_JSON,
                             inputs=[],
                             outputs=[json_input]
                         )
                         
                         gr.Markdown("## 参数设置")
-                        # 设置默认语音为en-US-AriaNeural
-                        default_voice_value = "en-US-AriaNeural - en-US (Female)" if "en-US-AriaNeural - en-US (Female)" in voices else ""
                         default_voice = gr.Dropdown(
-                            choices=[""] + list(voices.keys()), 
+                            choices=choice_list, 
                             label="默认语音", 
                             value=default_voice_value
                         )
                         default_rate = gr.Slider(minimum=-50, maximum=50, value=0, label="默认语速调整 (%)", step=1)
                         default_pitch = gr.Slider(minimum=-20, maximum=20, value=0, label="默认音调调整 (Hz)", step=1)
+                        # 取消勾选时，文本和语音参数未变化的已有文件将被跳过
+                        overwrite_checkbox = gr.Checkbox(label="覆盖已存在的文件", value=True)
                         
                         with gr.Row():
                             batch_generate_btn = gr.Button("批量生成所有音频", variant="primary")
@@ -293,37 +479,46 @@ async def create_demo():
                         single_warning = gr.Markdown(label="警告", visible=False)
                 
                 # Event handlers
-                def get_audio_files(json_input_str=None):
+                def get_audio_files(json_input_str=None, order_map=None):
                     """Get audio files list and return as tuple for choices and value, sorted by JSON order"""
-                    files = update_audio_list(json_input=json_input_str)
+                    files = update_audio_list(json_input=json_input_str, order_map=order_map)
                     # 使用正确的gr.update方法
                     return gr.update(choices=files, value=files[0] if files else None)
                 
                 # 使用gr.Generator类型的输出以支持实时进度更新
-                async def process_batch_with_progress(json_str, voice, rate, pitch):
+                async def process_batch_with_progress(json_str, voice, rate, pitch, overwrite):
+                    # 每次点击只解析一次JSON，批量生成和刷新文件列表时复用；解析失败时交由batch_text_to_speech报告错误
+                    try:
+                        tasks_list = await _loads_async(json_str)
+                    except (json.JSONDecodeError, orjson.JSONDecodeError):
+                        tasks_list = None
+                    # 预先计算文件名到JSON顺序的映射，每次刷新文件列表时直接复用
+                    order_map = build_order_map(tasks_list) if isinstance(tasks_list, list) else None
+                    
                     # 初始化进度显示
-                    yield "开始处理...", get_audio_files(json_str), "0/0"
+                    yield "开始处理...", get_audio_files(order_map=order_map), "0/0"
                     
-                    # 使用生成器获取每个任务的进度
-                    async for results, error, files, current, total in batch_text_to_speech(json_str, voice, rate, pitch):
+                    # 使用生成器获取每个任务的进度，界面刷新频率限制在约10次/秒
+                    batch_updates = batch_text_to_speech(json_str, voice, rate, pitch, overwrite=overwrite, tasks=tasks_list)
+                    async for results, error, files, current, total in _throttle_progress(batch_updates):
                         # 格式化结果文本
                         result_text = "\n".join(results) if results else "No results"
                         if error:
                             result_text = error
                         
                         # 更新进度显示并刷新文件列表
-                        yield result_text, get_audio_files(json_str), f"{current}/{total}"
+                        yield result_text, get_audio_files(order_map=order_map), f"{current}/{total}"
                 
                 # 配置批量生成按钮的事件处理器以支持实时进度更新
                 batch_generate_btn.click(
                     fn=process_batch_with_progress,
-                    inputs=[json_input, default_voice, default_rate, default_pitch],
+                    inputs=[json_input, default_voice, default_rate, default_pitch, overwrite_checkbox],
                     outputs=[batch_result, audio_files_list, progress_output]
                 )
                 
                 # Update audio preview when a file is selected (clicked)
                 audio_files_list.change(
-                    fn=lambda file_name: os.path.join("output_audio", file_name) if file_name else None,
+                    fn=lambda file_name: (_OUT_BASE + file_name) if file_name else None,
                     inputs=[audio_files_list],
                     outputs=[audio_preview]
                 )
@@ -353,32 +548,61 @@ async def create_demo():
     
     return demo
 
-def update_audio_list(output_dir="output_audio", json_input=None):
-    """Update the list of available audio files in the output directory, sorted by JSON order if provided"""
+# Cached mp3 listings per output directory: {path: (st_mtime_ns, scanned_at_ns, frozenset of file names)}
+_dir_cache = {}
+# A listing scanned this soon after the directory mtime is never reused: on filesystems with
+# coarse timestamps (FAT, network shares) a later change could share the same mtime
+_DIR_CACHE_RACY_NS = 2_000_000_000
+
+def _list_mp3_files(output_dir):
+    """Return the mp3 files in output_dir, rescanning only when the directory mtime changes"""
+    mtime = os.stat(output_dir).st_mtime_ns
+    cached = _dir_cache.get(output_dir)
+    if cached and cached[0] == mtime and cached[1] - mtime > _DIR_CACHE_RACY_NS:
+        return cached[2]
+    scanned_at = time.time_ns()
+    with os.scandir(output_dir) as entries:
+        files = frozenset(entry.name for entry in entries if entry.name.endswith('.mp3'))
+    _dir_cache[output_dir] = (mtime, scanned_at, files)
+    return files
+
+def build_order_map(tasks_list):
+    """Map each file_name in the task list to the index of its first occurrence"""
+    order_map = {}
+    for i, task in enumerate(tasks_list):
+        file_name = task.get("file_name") if isinstance(task, dict) else None
+        if isinstance(file_name, str):
+            order_map.setdefault(file_name, i)
+    return order_map
+
+def update_audio_list(output_dir="output_audio", json_input=None, order_map=None):
+    """Update the list of available audio files in the output directory, sorted by JSON order if provided
+
+    A precomputed build_order_map() result can be passed as order_map to skip re-parsing json_input.
+    """
     try:
         if not os.path.exists(output_dir):
             return []
         
-        # Get all mp3 files in the output directory
-        available_files = set(f for f in os.listdir(output_dir) if f.endswith('.mp3'))
+        # Get all mp3 files in the output directory, reusing the cached listing if unchanged
+        available_files = _list_mp3_files(output_dir)
         
         # If JSON input is provided, sort files according to JSON order
-        if json_input:
+        if order_map is None and json_input:
             try:
-                tasks = json.loads(json_input)
+                tasks = _loads(json_input)
                 if isinstance(tasks, list):
-                    # Create ordered list based on JSON
-                    ordered_files = []
-                    for task in tasks:
-                        if "file_name" in task and task["file_name"] in available_files:
-                            ordered_files.append(task["file_name"])
-                            available_files.remove(task["file_name"])
-                    # Add any remaining files that weren't in the JSON
-                    ordered_files.extend(sorted(available_files))
-                    return ordered_files
-            except json.JSONDecodeError:
+                    order_map = build_order_map(tasks)
+            except (json.JSONDecodeError, orjson.JSONDecodeError):
                 pass  # If JSON parsing fails, fall back to default sorting
         
+        if order_map is not None:
+            # Files listed in the JSON come first in JSON order
+            ordered_files = sorted((f for f in available_files if f in order_map), key=order_map.get)
+            # Add any remaining files that weren't in the JSON
+            ordered_files.extend(sorted(f for f in available_files if f not in order_map))
+            return ordered_files
+        
         # Default sorting (alphabetical)
         return sorted(available_files)
     except Exception as e: